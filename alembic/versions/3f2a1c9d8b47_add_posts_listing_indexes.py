@@ -0,0 +1,40 @@
+"""add posts listing indexes
+
+Revision ID: 3f2a1c9d8b47
+Revises: b8d4f6a1c3e7
+Create Date: 2026-08-28
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f2a1c9d8b47"
+down_revision = "b8d4f6a1c3e7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index for the public feed (is_published filter, newest first).
+    # if_not_exists keeps this runnable on databases provisioned with
+    # create_all from the current models, which already carry the index.
+    op.create_index(
+        "posts_published_idx",
+        "posts",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_published"),
+        if_not_exists=True,
+    )
+    # Composite index for per-user listings filtering (author_id, is_published)
+    op.create_index(
+        "posts_author_pub_idx",
+        "posts",
+        ["author_id", "is_published", sa.text("created_at DESC")],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("posts_author_pub_idx", table_name="posts", if_exists=True)
+    op.drop_index("posts_published_idx", table_name="posts", if_exists=True)
@@ -0,0 +1,30 @@
+"""add users unique indexes
+
+Revision ID: 9c71e4b2d0a5
+Revises: 3f2a1c9d8b47
+Create Date: 2026-08-28
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c71e4b2d0a5"
+down_revision = "3f2a1c9d8b47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The User model declares email/username as unique+indexed, but nothing
+    # guaranteed the indexes exist on databases whose schema predates the
+    # migration history. Login and existence checks probe both columns.
+    # These are the names SQLAlchemy generates for the model's indexed
+    # columns, so schemas provisioned from the model (create_all or the
+    # initial migration) already have them — hence if_not_exists.
+    op.create_index("ix_users_email", "users", ["email"], unique=True, if_not_exists=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username", table_name="users", if_exists=True)
+    op.drop_index("ix_users_email", table_name="users", if_exists=True)
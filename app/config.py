@@ -1,5 +1,6 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import FrozenSet, Optional
 
 
 class Settings(BaseSettings):
@@ -10,9 +11,16 @@ class Settings(BaseSettings):
     debug: bool = False
     redis_url: str = "redis://localhost:6379/0"
     rate_limit_per_minute: int = 60
-    cors_origins: List[str] = ["http://localhost:3000"]
-    trusted_hosts: List[str] = ["localhost", "127.0.0.1"]
-    
+    # Frozensets so per-request membership checks are O(1); middlewares that
+    # need a list get list(settings.cors_origins) at registration time
+    cors_origins: FrozenSet[str] = frozenset({"http://localhost:3000"})
+    trusted_hosts: FrozenSet[str] = frozenset({"localhost", "127.0.0.1"})
+
+    @field_validator("cors_origins", "trusted_hosts", mode="after")
+    @classmethod
+    def _to_frozenset(cls, v):
+        return frozenset(v)
+
     class Config:
         env_file = ".env"
 
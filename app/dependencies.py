@@ -1,17 +1,38 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import User
 from app.auth import verify_token
+from asyncio import Lock
+from cachetools import TTLCache
 from typing import Optional
+import hashlib
+import time
 
 security = HTTPBearer(auto_error=False)
 
+# Process-local cache of already-verified tokens so the hot path can skip
+# both the JWT signature check and the user lookup filter. Entries are keyed
+# by a blake2b digest of the raw credential (raw JWTs are never stored) and
+# hold (user id, token expiry timestamp).
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = Lock()
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+async def invalidate_token(token: str) -> None:
+    """Remove a token from the verified-token cache (e.g. on logout)."""
+    async with _token_cache_lock:
+        _TOKEN_CACHE.pop(_token_cache_key(token), None)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     Get current user from JWT token.
@@ -19,58 +40,81 @@ async def get_current_user(
     """
     if not credentials:
         return None
-    
+
+    cache_key = _token_cache_key(credentials.credentials)
+
+    # Fast path: token already verified recently
+    async with _token_cache_lock:
+        cached = _TOKEN_CACHE.get(cache_key)
+
+    if cached is not None:
+        user_id, exp_ts = cached
+        if time.time() < exp_ts:
+            # Primary-key get hits the session identity map when warm and
+            # otherwise issues a trivial PK SELECT
+            return await db.get(User, user_id)
+        # Token expired since it was cached; drop it and re-verify below
+        async with _token_cache_lock:
+            _TOKEN_CACHE.pop(cache_key, None)
+
     try:
-        # Verify token and get username
+        # Verify token and get the user id from the sub claim
         payload = verify_token(credentials.credentials)
-        username = payload.get("username")
-        
-        if not username:
-            return None
-        
-        # Get user from database
-        user = db.query(User).filter(User.username == username).first()
+        user_id = payload["user_id"]
+
+        # Get user from database via the primary key
+        user = await db.get(User, user_id)
+
+        if user:
+            exp_ts = payload.get("exp") or (time.time() + _TOKEN_CACHE.ttl)
+            async with _token_cache_lock:
+                _TOKEN_CACHE[cache_key] = (user_id, exp_ts)
+
         return user
-        
+
     except HTTPException:
         return None
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+def require_user(*, superuser: bool = False):
     """
-    Get current active user. Raises exception if no user or inactive.
+    Dependency factory performing token verification, user fetch and the
+    is_active/is_superuser checks in one pass. Chaining these as separate
+    Depends() levels cost one coroutine frame per level on every request.
     """
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-    
-    return current_user
+    async def dependency(
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: AsyncSession = Depends(get_db)
+    ) -> User:
+        current_user = await get_current_user(credentials, db)
 
+        if not current_user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
-async def get_current_superuser(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
-    """
-    Get current superuser. Raises exception if not a superuser.
-    """
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    return current_user
+        if not current_user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inactive user"
+            )
+
+        if superuser and not current_user.is_superuser:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+
+        return current_user
+
+    return dependency
+
+
+# Shared dependency instances; routers keep using these names in Depends()
+get_current_active_user = require_user()
+get_current_superuser = require_user(superuser=True)
 
 
 async def optional_user(
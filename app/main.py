@@ -1,20 +1,24 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.config import settings
 from app.middleware import (
     limiter,
-    security_headers_middleware,
-    request_logging_middleware,
-    trusted_hosts_middleware,
-    rate_limit_handler
+    UnifiedMiddleware,
+    rate_limit_handler,
+    RL_5,
+    RL_10,
+    RL_30
 )
 # Import routers
 from app.routers import users, posts, auth, admin
 import uvicorn
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +30,7 @@ app = FastAPI(
     title="Haikudo Backend API",
     description="A FastAPI backend for Haikudo application with enhanced security",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     debug=settings.debug,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None
@@ -35,31 +40,24 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(429, rate_limit_handler)
 
-# Add security headers middleware
-app.middleware("http")(security_headers_middleware)
-
-# Add request logging middleware
-app.middleware("http")(request_logging_middleware)
-
-# Add trusted hosts middleware (only in production)
-if not settings.debug:
-    app.middleware("http")(trusted_hosts_middleware)
+# Security headers and request logging in one ASGI middleware
+app.add_middleware(UnifiedMiddleware)
 
 # Add CORS middleware with proper configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins if not settings.debug else ["*"],
+    allow_origins=list(settings.cors_origins) if not settings.debug else ["*"],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Process-Time"]
+    expose_headers=["X-Request-ID", "X-Process-Time", "X-Next-Cursor"]
 )
 
 # Add trusted host middleware (alternative approach)
 if not settings.debug:
     app.add_middleware(
-        TrustedHostMiddleware, 
-        allowed_hosts=settings.trusted_hosts
+        TrustedHostMiddleware,
+        allowed_hosts=list(settings.trusted_hosts)
     )
 
 # Include routers
@@ -70,13 +68,13 @@ app.include_router(admin.router)
 
 
 @app.get("/")
-@limiter.limit("10/minute")
+@RL_10
 async def root(request: Request):
     return {"message": "Welcome to Haikudo Backend API"}
 
 
 @app.get("/health")
-@limiter.limit("30/minute")
+@RL_30
 async def health_check(request: Request):
     return {
         "status": "healthy", 
@@ -87,11 +85,11 @@ async def health_check(request: Request):
 
 
 @app.get("/api/v1/test-db")
-@limiter.limit("5/minute")
-async def test_database(request: Request, db: Session = Depends(get_db)):
+@RL_5
+async def test_database(request: Request, db: AsyncSession = Depends(get_db)):
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         return {"status": "Database connection successful"}
     except Exception as e:
         raise HTTPException(
@@ -100,48 +98,53 @@ async def test_database(request: Request, db: Session = Depends(get_db)):
         )
 
 
+# The info payload is pure constants; build and serialize it once at import
+# so the handler only hands pre-encoded bytes to the ASGI send.
+_API_INFO_BYTES = orjson.dumps({
+    "api_name": "Haikudo Backend API",
+    "version": "1.0.0",
+    "description": "A secure FastAPI backend with PostgreSQL",
+    "endpoints": {
+        "health": "/health",
+        "database_test": "/api/v1/test-db",
+        "api_info": "/api/v1/info",
+        "users": "/api/v1/users",
+        "posts": "/api/v1/posts",
+        "auth": "/api/v1/auth",
+        "admin": "/api/v1/admin"
+    },
+    "security_features": [
+        "Rate limiting",
+        "Security headers",
+        "Request logging",
+        "CORS protection",
+        "Trusted hosts (production)",
+        "JWT Authentication",
+        "Password validation",
+        "Input sanitization"
+    ],
+    "available_routes": [
+        "POST /api/v1/users/register - User registration",
+        "POST /api/v1/users/login - User login",
+        "GET /api/v1/users/profile - Get user profile",
+        "PUT /api/v1/users/profile - Update user profile",
+        "GET /api/v1/users - List users",
+        "POST /api/v1/posts - Create post",
+        "GET /api/v1/posts - List posts",
+        "GET /api/v1/posts/{id} - Get specific post",
+        "PUT /api/v1/posts/{id} - Update post",
+        "DELETE /api/v1/posts/{id} - Delete post",
+        "POST /api/v1/auth/forgot-password - Password reset",
+        "GET /api/v1/admin/stats - System statistics"
+    ]
+})
+
+
 @app.get("/api/v1/info")
-@limiter.limit("10/minute") 
+@RL_10
 async def api_info(request: Request):
     """Get API information and available endpoints"""
-    return {
-        "api_name": "Haikudo Backend API",
-        "version": "1.0.0",
-        "description": "A secure FastAPI backend with PostgreSQL",
-        "endpoints": {
-            "health": "/health",
-            "database_test": "/api/v1/test-db",
-            "api_info": "/api/v1/info",
-            "users": "/api/v1/users",
-            "posts": "/api/v1/posts",
-            "auth": "/api/v1/auth",
-            "admin": "/api/v1/admin"
-        },
-        "security_features": [
-            "Rate limiting",
-            "Security headers", 
-            "Request logging",
-            "CORS protection",
-            "Trusted hosts (production)",
-            "JWT Authentication",
-            "Password validation",
-            "Input sanitization"
-        ],
-        "available_routes": [
-            "POST /api/v1/users/register - User registration",
-            "POST /api/v1/users/login - User login",
-            "GET /api/v1/users/profile - Get user profile",
-            "PUT /api/v1/users/profile - Update user profile",
-            "GET /api/v1/users - List users",
-            "POST /api/v1/posts - Create post",
-            "GET /api/v1/posts - List posts",
-            "GET /api/v1/posts/{id} - Get specific post",
-            "PUT /api/v1/posts/{id} - Update post",
-            "DELETE /api/v1/posts/{id} - Delete post",
-            "POST /api/v1/auth/forgot-password - Password reset",
-            "GET /api/v1/admin/stats - System statistics"
-        ]
-    }
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -7,78 +7,128 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 import time
 import logging
-import uuid
-from typing import Callable
+from os import urandom
 import redis
+import redis.asyncio as aioredis
 from app.config import settings
 
-# Set up Redis for rate limiting
-try:
-    redis_client = redis.from_url(settings.redis_url)
-    redis_client.ping()
-except (redis.ConnectionError, redis.TimeoutError):
-    # Fallback to in-memory rate limiting if Redis is not available
-    redis_client = None
-    logging.warning("Redis not available, using in-memory rate limiting")
+# Set up Redis for rate limiting. The limiter's storage backend consumes
+# this sync pool directly via storage_options, so each request reuses an
+# established socket instead of paying a TCP+AUTH handshake. Connections are
+# established lazily on first use — probing with ping() at import time would
+# block worker startup and race a slow-starting Redis.
+redis_pool = redis.ConnectionPool.from_url(settings.redis_url, max_connections=100)
 
-# Rate limiting
+# Async client for application code paths (admin endpoints, caches). The
+# limiter's storage backend inside the limits library stays on the sync pool
+# above; everything called from request handlers must use this one so the
+# event loop never blocks on a Redis socket.
+async_redis_pool = aioredis.ConnectionPool.from_url(settings.redis_url, max_connections=100)
+async_redis = aioredis.Redis(connection_pool=async_redis_pool)
+
+# Rate limiting; falls back to in-memory limits if Redis is unreachable.
+# The sliding window (Redis sorted sets) avoids the fixed-window burst at
+# window boundaries, and the storage shares the module connection pool so
+# the limiter does not open sockets of its own.
 limiter = Limiter(
     key_func=get_remote_address,
-    storage_uri=settings.redis_url if redis_client else "memory://",
+    storage_uri=settings.redis_url,
+    storage_options={"connection_pool": redis_pool},
+    strategy="moving-window",
+    in_memory_fallback_enabled=True,
     default_limits=[f"{settings.rate_limit_per_minute}/minute"]
 )
 
-# Security headers middleware
-async def security_headers_middleware(request: Request, call_next: Callable):
-    response = await call_next(request)
-    
-    # Security headers
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-    response.headers["Content-Security-Policy"] = "default-src 'self'"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-    
-    return response
+# Shared per-minute limit decorators. Each distinct policy is built (and its
+# limit string parsed) once here instead of once per decorated route; routes
+# with the same budget reuse the same decorator object.
+RL_2 = limiter.limit("2/minute")
+RL_3 = limiter.limit("3/minute")
+RL_5 = limiter.limit("5/minute")
+RL_10 = limiter.limit("10/minute")
+RL_20 = limiter.limit("20/minute")
+RL_30 = limiter.limit("30/minute")
+RL_50 = limiter.limit("50/minute")
 
-# Request logging middleware
-async def request_logging_middleware(request: Request, call_next: Callable):
-    request_id = str(uuid.uuid4())
-    start_time = time.time()
-    
-    # Log request
-    logging.info(
-        f"Request {request_id}: {request.method} {request.url.path} "
-        f"from {request.client.host if request.client else 'unknown'}"
-    )
-    
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logging.info(
-        f"Response {request_id}: {response.status_code} "
-        f"processed in {process_time:.3f}s"
-    )
-    
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
+# Paths polled continuously by load balancers and monitoring; logging every
+# probe would drown the logs and burn middleware cycles for nothing.
+_UNLOGGED_PATHS = frozenset({"/", "/health", "/metrics"})
 
-# Trusted host middleware
-async def trusted_hosts_middleware(request: Request, call_next: Callable):
-    host = request.headers.get("host", "").split(":")[0]
-    
-    if not settings.debug and host not in settings.trusted_hosts:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"detail": "Untrusted host"}
+# Security headers attached to every response, pre-encoded in the raw ASGI
+# wire format so the send wrapper only extends the header list.
+_STATIC_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    (b"content-security-policy", b"default-src 'self'"),
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+]
+
+
+class UnifiedMiddleware:
+    """
+    Single ASGI middleware combining the security-headers and
+    request-logging concerns. Working directly on the scope/send callables
+    avoids stacking Python coroutine frames (and Request/Response re-wraps)
+    on every request. Host validation is left to Starlette's
+    TrustedHostMiddleware registered in main.py.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] in _UNLOGGED_PATHS:
+            # Skip only the logging and correlation-id work for probe
+            # traffic; the security headers go on every response, and the
+            # extend is a single C-level list op
+            async def send_static(message):
+                if message["type"] == "http.response.start":
+                    message["headers"].extend(_STATIC_HEADERS)
+                await send(message)
+
+            await self.app(scope, receive, send_static)
+            return
+
+        # Correlation id only — no uniqueness-across-hosts requirement, so 8
+        # random bytes beat the cost of a full uuid4 (16 bytes + dash
+        # formatting)
+        request_id = urandom(8).hex()
+        start_time = time.time()
+        client = scope.get("client")
+
+        # Log request
+        logging.info(
+            f"Request {request_id}: {scope['method']} {scope['path']} "
+            f"from {client[0] if client else 'unknown'}"
+        )
+
+        status_code = 500
+
+        async def send_with_headers(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.time() - start_time
+                message["headers"].extend(_STATIC_HEADERS)
+                message["headers"].append((b"x-request-id", request_id.encode("latin-1")))
+                message["headers"].append((b"x-process-time", f"{process_time}".encode("latin-1")))
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+        # Log response
+        process_time = time.time() - start_time
+        logging.info(
+            f"Response {request_id}: {status_code} "
+            f"processed in {process_time:.3f}s"
         )
-    
-    return await call_next(request)
 
 # Custom rate limit exceeded handler
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -20,6 +20,10 @@ class User(Base):
     # Relationship to posts
     posts = relationship("Post", back_populates="author")
 
+    # Fetch server defaults (created_at) via INSERT ... RETURNING so new
+    # rows never need a follow-up refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class Post(Base):
     __tablename__ = "posts"
@@ -34,3 +38,12 @@ class Post(Base):
 
     # Relationship to user
     author = relationship("User", back_populates="posts")
+
+    # Indexes backing the listing predicates: the public feed filters on
+    # is_published (partial index, newest first) and per-user listings
+    # filter on (author_id, is_published)
+    __table_args__ = (
+        Index("posts_published_idx", created_at.desc(), postgresql_where=is_published),
+        Index("posts_author_pub_idx", author_id, is_published, created_at.desc()),
+    )
+    __mapper_args__ = {"eager_defaults": True}
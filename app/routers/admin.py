@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.middleware import limiter
+from app.middleware import async_redis, RL_2, RL_3, RL_5, RL_10
 from app.config import settings
-import redis
 import logging
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
@@ -11,19 +11,19 @@ logger = logging.getLogger(__name__)
 
 
 @router.get("/stats")
-@limiter.limit("10/minute")
-async def get_system_stats(request: Request, db: Session = Depends(get_db)):
+@RL_10
+async def get_system_stats(request: Request, db: AsyncSession = Depends(get_db)):
     """Get system statistics (admin only)"""
     try:
-        # Get database stats
-        user_count = db.execute("SELECT COUNT(*) FROM users").scalar()
-        post_count = db.execute("SELECT COUNT(*) FROM posts").scalar()
+        # Get database stats in a single round-trip
+        user_count, post_count = (await db.execute(text(
+            "SELECT (SELECT COUNT(*) FROM users), (SELECT COUNT(*) FROM posts)"
+        ))).one()
         
         # Get Redis stats if available
         redis_stats = {}
         try:
-            redis_client = redis.from_url(settings.redis_url)
-            redis_info = redis_client.info()
+            redis_info = await async_redis.info()
             redis_stats = {
                 "connected_clients": redis_info.get("connected_clients", 0),
                 "used_memory": redis_info.get("used_memory_human", "N/A"),
@@ -50,7 +50,7 @@ async def get_system_stats(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/logs")
-@limiter.limit("5/minute")
+@RL_5
 async def get_recent_logs(request: Request, lines: int = 100):
     """Get recent application logs (admin only)"""
     # TODO: Implement log retrieval
@@ -58,7 +58,7 @@ async def get_recent_logs(request: Request, lines: int = 100):
 
 
 @router.post("/maintenance")
-@limiter.limit("2/minute")
+@RL_2
 async def toggle_maintenance_mode(request: Request, enabled: bool):
     """Toggle maintenance mode (admin only)"""
     # TODO: Implement maintenance mode
@@ -66,12 +66,11 @@ async def toggle_maintenance_mode(request: Request, enabled: bool):
 
 
 @router.delete("/cache")
-@limiter.limit("3/minute")
+@RL_3
 async def clear_cache(request: Request):
     """Clear application cache (admin only)"""
     try:
-        redis_client = redis.from_url(settings.redis_url)
-        redis_client.flushdb()
+        await async_redis.flushdb()
         return {"message": "Cache cleared successfully"}
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Request
-from app.middleware import limiter
+from app.middleware import RL_3, RL_5, RL_10
 
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
 
 @router.post("/forgot-password")
-@limiter.limit("3/minute")
+@RL_3
 async def forgot_password(request: Request, email: str):
     """Send password reset email"""
     # TODO: Implement password reset functionality
@@ -13,7 +13,7 @@ async def forgot_password(request: Request, email: str):
 
 
 @router.post("/reset-password")
-@limiter.limit("5/minute")
+@RL_5
 async def reset_password(request: Request, token: str, new_password: str):
     """Reset password with token"""
     # TODO: Implement password reset with token
@@ -21,7 +21,7 @@ async def reset_password(request: Request, token: str, new_password: str):
 
 
 @router.post("/refresh-token")
-@limiter.limit("10/minute")
+@RL_10
 async def refresh_token(request: Request, refresh_token: str):
     """Refresh JWT access token"""
     # TODO: Implement token refresh
@@ -1,72 +1,180 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from cachetools import TTLCache
 from app.models import User as UserModel
 from app.schemas import UserLogin, LoginResponse
-from app.auth import verify_password, create_access_token
+from app.auth import (
+    create_access_token,
+    get_password_hash,
+    get_password_hash_async,
+    needs_rehash,
+    verify_password_async,
+)
+from app.config import settings
+from app.middleware import async_redis
 from app.security import get_client_ip
 from datetime import timedelta
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Verified when the account does not exist so a missing user burns the same
+# bcrypt cost as a wrong password: no user-existence timing oracle, and
+# attackers cannot probe emails cheaply.
+_DUMMY_HASH = get_password_hash("not-a-real-password")
+
+# Emails recently confirmed absent; repeated misses (credential stuffing)
+# are answered without a DB round-trip while the entry lives.
+_UNKNOWN_EMAILS: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Recent bcrypt verification outcomes keyed by an HMAC of (email, password)
+# under the server secret as pepper — credential material never appears in
+# the cache. A client replaying the same credentials within the TTL skips
+# the bcrypt work entirely; the short TTL bounds how long a password change
+# can lag.
+_VERIFY_PEPPER = settings.secret_key.encode()
+_VERIFY_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+def _verify_cache_key(email: str, password: str) -> bytes:
+    return hmac.new(
+        _VERIFY_PEPPER, email.encode() + b"|" + password.encode(), "sha256"
+    ).digest()
+
+
+# Per-(IP, email) login throttle, enforced before any DB or bcrypt work so a
+# handful of concurrent login floods cannot tie up cores. The route-level
+# limiter keys on IP alone; this bounds attempts per target account too.
+_LOGIN_ATTEMPT_LIMIT = 5
+_LOGIN_WINDOW_SECONDS = 60
+_LOCAL_ATTEMPTS: TTLCache = TTLCache(maxsize=100_000, ttl=_LOGIN_WINDOW_SECONDS)
+
+
+async def _check_login_rate(client_ip: str, email: str) -> None:
+    key = f"login-rate:{client_ip}:{email}"
+    try:
+        attempts = await async_redis.incr(key)
+        if attempts == 1:
+            await async_redis.expire(key, _LOGIN_WINDOW_SECONDS)
+    except Exception:
+        # Redis unavailable: degrade to a per-process window
+        attempts = _LOCAL_ATTEMPTS.get(key, 0) + 1
+        _LOCAL_ATTEMPTS[key] = attempts
+
+    if attempts > _LOGIN_ATTEMPT_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(_LOGIN_WINDOW_SECONDS)}
+        )
+
+
+def forget_unknown_email(email: str) -> None:
+    """Drop a cached negative lookup (called when that email registers)."""
+    _UNKNOWN_EMAILS.pop(email, None)
+
+
+# Login lookup statement compiled once and cached by lambda identity; each
+# call only binds a new email value instead of rebuilding and recompiling
+# the select.
+_LOGIN_LOOKUP = lambda_stmt(
+    lambda: select(UserModel).where(UserModel.email == bindparam("email"))
+)
+
 
 class AuthService:
     """Service class for authentication-related business logic"""
-    
+
     @staticmethod
-    def authenticate_user(db: Session, login_data: UserLogin, client_ip: str = None) -> LoginResponse:
+    async def authenticate_user(db: AsyncSession, login_data: UserLogin, client_ip: str = None) -> LoginResponse:
         """Authenticate user and return login response"""
         logger.info(f"Login attempt from {client_ip} for email: {login_data.email}")
-        
-        # Find user by email
-        db_user = db.query(UserModel).filter(UserModel.email == login_data.email).first()
-        
-        # Check credentials
-        if not db_user or not verify_password(login_data.password, db_user.hashed_password):
+
+        # Shed abusive traffic before it reaches the expensive work below
+        await _check_login_rate(client_ip or "unknown", login_data.email)
+
+        # Find user by email, skipping the DB for recently-confirmed misses
+        if login_data.email in _UNKNOWN_EMAILS:
+            db_user = None
+        else:
+            db_user = await db.scalar(_LOGIN_LOOKUP, {"email": login_data.email})
+            if db_user is None:
+                _UNKNOWN_EMAILS[login_data.email] = True
+
+        # Check credentials; a dummy verify keeps the missing-user path as
+        # expensive as a real one
+        if db_user is None:
+            await verify_password_async(login_data.password, _DUMMY_HASH)
+            password_ok = False
+        else:
+            cache_key = _verify_cache_key(login_data.email, login_data.password)
+            password_ok = _VERIFY_CACHE.get(cache_key)
+            if password_ok is None:
+                password_ok = await verify_password_async(
+                    login_data.password, db_user.hashed_password
+                )
+                _VERIFY_CACHE[cache_key] = password_ok
+
+        if not password_ok:
             logger.warning(f"Failed login attempt from {client_ip} for email: {login_data.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
-        
+
         # Check if user is active
         if not db_user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Account is inactive"
             )
-        
+
+        # Lazy migration: a successful login is the only moment the plaintext
+        # is available, so hashes on a deprecated scheme (old bcrypt rows) or
+        # stale parameters are upgraded in place here
+        if needs_rehash(db_user.hashed_password):
+            new_hash = await get_password_hash_async(login_data.password)
+            await db.execute(
+                update(UserModel)
+                .where(UserModel.id == db_user.id)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+            logger.info(f"Password hash upgraded for user: {login_data.email}")
+
         # Create access token
         access_token_expires = timedelta(minutes=30)
         access_token = create_access_token(
-            data={"sub": db_user.username},
+            data={"sub": str(db_user.id), "username": db_user.username},
             expires_delta=access_token_expires
         )
-        
+
         logger.info(f"User logged in successfully: {login_data.email} from {client_ip}")
-        
+
         return LoginResponse(
             access_token=access_token,
             token_type="bearer",
             user=db_user
         )
-    
+
     @staticmethod
     def refresh_token(refresh_token: str) -> dict:
         """Refresh JWT token (placeholder for future implementation)"""
         # TODO: Implement token refresh logic
         logger.info("Token refresh requested")
         return {"message": "Token refresh functionality not implemented yet"}
-    
+
     @staticmethod
-    def initiate_password_reset(db: Session, email: str) -> dict:
+    def initiate_password_reset(db: AsyncSession, email: str) -> dict:
         """Initiate password reset process"""
         # TODO: Implement password reset logic
         logger.info(f"Password reset requested for email: {email}")
         return {"message": "Password reset email sent (if email exists)"}
-    
+
     @staticmethod
-    def reset_password(db: Session, token: str, new_password: str) -> dict:
+    def reset_password(db: AsyncSession, token: str, new_password: str) -> dict:
         """Reset password with token"""
         # TODO: Implement password reset with token validation
         logger.info("Password reset with token requested")
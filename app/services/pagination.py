@@ -0,0 +1,31 @@
+"""Keyset (cursor) pagination helpers shared by the listing services.
+
+Cursors encode the (created_at, id) of the last row on a page; the next
+page filters on that pair instead of OFFSET, so page cost stays constant
+no matter how deep the client scrolls.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor back into its (created_at, id) keyset position"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, _, item_id = raw.partition("|")
+        return datetime.fromisoformat(timestamp), int(item_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
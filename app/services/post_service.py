@@ -1,7 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 from fastapi import HTTPException, status
+from typing import Optional
 from app.models import Post as PostModel
 from app.schemas import PostCreate, PostUpdate
+from app.services.pagination import decode_cursor, encode_cursor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,9 +13,9 @@ logger = logging.getLogger(__name__)
 
 class PostService:
     """Service class for post-related business logic"""
-    
+
     @staticmethod
-    def create_post(db: Session, post_data: PostCreate, author_id: int) -> PostModel:
+    async def create_post(db: AsyncSession, post_data: PostCreate, author_id: int) -> PostModel:
         """Create a new post"""
         db_post = PostModel(
             title=post_data.title,
@@ -19,79 +23,150 @@ class PostService:
             author_id=author_id,
             is_published=post_data.is_published
         )
-        
+
         db.add(db_post)
-        db.commit()
-        db.refresh(db_post)
-        
+        await db.commit()
+
         logger.info(f"Post created successfully: {db_post.id} by user {author_id}")
-        
+
         return db_post
-    
+
     @staticmethod
-    def get_post_by_id(db: Session, post_id: int) -> PostModel:
+    async def get_post_by_id(db: AsyncSession, post_id: int) -> PostModel:
         """Get post by ID"""
-        db_post = db.query(PostModel).filter(PostModel.id == post_id).first()
-        
+        # Session.get consults the identity map before touching the DB, so
+        # fetch-then-mutate flows in the same request reuse the loaded row
+        db_post = await db.get(PostModel, post_id)
+
         if not db_post:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Post not found"
             )
-        
+
         return db_post
-    
+
     @staticmethod
-    def list_posts(db: Session, skip: int = 0, limit: int = 100, published_only: bool = True) -> list[PostModel]:
-        """Get paginated list of posts"""
-        query = db.query(PostModel)
-        
+    async def list_posts(
+        db: AsyncSession,
+        limit: int = 100,
+        published_only: bool = True,
+        cursor: Optional[str] = None
+    ) -> tuple[list[PostModel], Optional[str]]:
+        """Get a page of posts plus the cursor for the next page"""
+        # Batch-load authors in one extra SELECT instead of one per post;
+        # raiseload turns any other lazy access into an error rather than a
+        # silent N+1
+        stmt = select(PostModel).options(
+            selectinload(PostModel.author), raiseload("*")
+        )
+
         if published_only:
-            query = query.filter(PostModel.is_published == True)
-        
-        return query.offset(skip).limit(limit).all()
-    
+            stmt = stmt.where(PostModel.is_published == True)
+
+        # Keyset pagination: constant cost per page, matches the partial
+        # index on created_at DESC
+        if cursor:
+            last_ts, last_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(PostModel.created_at, PostModel.id) < (last_ts, last_id)
+            )
+
+        stmt = stmt.order_by(
+            PostModel.created_at.desc(), PostModel.id.desc()
+        ).limit(limit)
+
+        posts = list((await db.execute(stmt)).scalars().all())
+
+        next_cursor = None
+        if len(posts) == limit and posts:
+            last = posts[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return posts, next_cursor
+
     @staticmethod
-    def get_user_posts(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[PostModel]:
+    async def get_user_posts(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> list[PostModel]:
         """Get posts by a specific user"""
-        return db.query(PostModel).filter(
+        stmt = select(PostModel).options(
+            selectinload(PostModel.author), raiseload("*")
+        ).where(
             PostModel.author_id == user_id,
             PostModel.is_published == True
-        ).offset(skip).limit(limit).all()
-    
+        ).offset(skip).limit(limit)
+
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
     @staticmethod
-    def update_post(db: Session, post: PostModel, post_update: PostUpdate, user_id: int) -> PostModel:
+    async def update_post(db: AsyncSession, post_id: int, post_update: PostUpdate, user_id: int) -> PostModel:
         """Update a post (only by owner)"""
-        # Check ownership
-        if post.author_id != user_id:
+        # model_dump goes straight to pydantic-core; .dict() is a deprecated
+        # v1 shim that adds a warning and an extra indirection per request
+        update_data = post_update.model_dump(exclude_unset=True)
+
+        if not update_data:
+            return await PostService.get_post_by_id(db, post_id)
+
+        # One UPDATE ... RETURNING with the ownership check in the WHERE
+        # clause: no prior SELECT, no ORM flush machinery, no refresh
+        result = await db.execute(
+            update(PostModel)
+            .where(PostModel.id == post_id, PostModel.author_id == user_id)
+            .values(**update_data)
+            .returning(PostModel)
+        )
+        updated = result.scalar_one_or_none()
+
+        if updated is None:
+            await db.rollback()
+            # Nothing updated: distinguish missing post from foreign post
+            exists = await db.scalar(
+                select(PostModel.id).where(PostModel.id == post_id)
+            )
+            if exists is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Post not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to update this post"
             )
-        
-        # Update post fields
-        update_data = post_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(post, field, value)
-        
-        db.commit()
-        db.refresh(post)
-        
-        logger.info(f"Post updated successfully: {post.id} by user {user_id}")
-        
-        return post
-    
+
+        await db.commit()
+
+        logger.info(f"Post updated successfully: {post_id} by user {user_id}")
+
+        return updated
+
     @staticmethod
-    def delete_post(db: Session, post: PostModel, user_id: int) -> None:
+    async def delete_post(db: AsyncSession, post_id: int, user_id: int) -> None:
         """Delete a post (only by owner)"""
-        # Check ownership
-        if post.author_id != user_id:
+        # One DELETE with the ownership check in the WHERE clause: a single
+        # round-trip and no window between check and delete
+        result = await db.execute(
+            delete(PostModel)
+            .where(PostModel.id == post_id, PostModel.author_id == user_id)
+            .returning(PostModel.id)
+        )
+
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            # Nothing deleted: distinguish missing post from foreign post
+            exists = await db.scalar(
+                select(PostModel.id).where(PostModel.id == post_id)
+            )
+            if exists is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Post not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to delete this post"
             )
-        
-        db.delete(post)
-        db.commit()
-        
-        logger.info(f"Post deleted successfully: {post.id} by user {user_id}")
+
+        await db.commit()
+
+        logger.info(f"Post deleted successfully: {post_id} by user {user_id}")
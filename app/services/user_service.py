@@ -1,73 +1,122 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, lambda_stmt, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from typing import Optional
 from app.models import User as UserModel
 from app.schemas import UserCreate, UserUpdate
-from app.auth import get_password_hash
+from app.services.pagination import decode_cursor, encode_cursor
+from app.auth import get_password_hash_async
+from app.middleware import async_redis
 from app.security import SecurityValidator
+from app.services.auth_service import forget_unknown_email
+from datetime import datetime
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Write-through Redis cache for user rows resolved by id — the lookup behind
+# most authenticated requests. Entries are short-lived and deleted on
+# update/delete; the password hash is deliberately never cached.
+_USER_CACHE_TTL = 60
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def _serialize_user(user: UserModel) -> bytes:
+    return orjson.dumps({
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    })
+
+
+def _deserialize_user(raw: bytes) -> UserModel:
+    data = orjson.loads(raw)
+    for field in ("created_at", "updated_at"):
+        if data[field] is not None:
+            data[field] = datetime.fromisoformat(data[field])
+    # Detached snapshot; good for read-only serialization, not for mutation
+    return UserModel(**data)
+
+# Hot lookup statement, compiled once via lambda caching; callers bind the
+# email per execution.
+_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(UserModel).where(UserModel.email == bindparam("email"))
+)
+
 
 class UserService:
     """Service class for user-related business logic"""
-    
+
     @staticmethod
     def validate_user_data(user_data: UserCreate) -> None:
         """Validate user registration data"""
         # Validate password strength
         password_validation = SecurityValidator.validate_password_strength(user_data.password)
-        if not password_validation["valid"]:
+        if not password_validation.valid:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "message": "Password does not meet security requirements",
-                    "issues": password_validation["issues"]
+                    "issues": list(password_validation.issues)
                 }
             )
-        
+
         # Validate username
         username_validation = SecurityValidator.validate_username(user_data.username)
-        if not username_validation["valid"]:
+        if not username_validation.valid:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail={
                     "message": "Username is invalid",
-                    "issues": username_validation["issues"]
+                    "issues": list(username_validation.issues)
                 }
             )
-    
+
     @staticmethod
-    def check_user_exists(db: Session, email: str, username: str) -> None:
+    async def check_user_exists(db: AsyncSession, email: str, username: str) -> None:
         """Check if user with email or username already exists"""
-        db_user = db.query(UserModel).filter(
-            (UserModel.email == email) | (UserModel.username == username)
-        ).first()
-        
-        if db_user:
-            if db_user.email == email:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username already taken"
-                )
-    
+        # Two equality probes instead of one OR filter: each side hits its
+        # unique index directly, where the OR can degrade to a BitmapOr or
+        # sequential scan on large tables
+        email_taken = await db.scalar(
+            select(UserModel.id).where(UserModel.email == email).limit(1)
+        )
+        if email_taken is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+
+        username_taken = await db.scalar(
+            select(UserModel.id).where(UserModel.username == username).limit(1)
+        )
+        if username_taken is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already taken"
+            )
+
     @staticmethod
-    def create_user(db: Session, user_data: UserCreate) -> UserModel:
+    async def create_user(db: AsyncSession, user_data: UserCreate) -> UserModel:
         """Create a new user in the database"""
         # Validate user data
         UserService.validate_user_data(user_data)
-        
+
         # Check if user already exists
-        UserService.check_user_exists(db, user_data.email, user_data.username)
-        
+        await UserService.check_user_exists(db, user_data.email, user_data.username)
+
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
-        
+        hashed_password = await get_password_hash_async(user_data.password)
+
         # Create user instance
         db_user = UserModel(
             email=user_data.email,
@@ -76,58 +125,80 @@ class UserService:
             hashed_password=hashed_password,
             is_active=user_data.is_active
         )
-        
+
         # Save to database
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        
+        await db.commit()
+
+        # The email is no longer a guaranteed login miss
+        forget_unknown_email(user_data.email)
+
         logger.info(f"User created successfully: {user_data.email}")
-        
+
         return db_user
-    
+
     @staticmethod
-    def get_user_by_id(db: Session, user_id: int) -> UserModel:
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> UserModel:
         """Get user by ID"""
-        db_user = db.query(UserModel).filter(UserModel.id == user_id).first()
-        
+        cache_key = _user_cache_key(user_id)
+
+        try:
+            cached = await async_redis.get(cache_key)
+        except Exception:
+            cached = None
+        if cached:
+            return _deserialize_user(cached)
+
+        # Identity-map-aware primary key lookup
+        db_user = await db.get(UserModel, user_id)
+
         if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        
+
+        try:
+            await async_redis.setex(cache_key, _USER_CACHE_TTL, _serialize_user(db_user))
+        except Exception:
+            pass
+
         return db_user
-    
+
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> UserModel:
+    async def get_user_by_email(db: AsyncSession, email: str) -> UserModel:
         """Get user by email"""
-        db_user = db.query(UserModel).filter(UserModel.email == email).first()
-        
+        db_user = await db.scalar(_USER_BY_EMAIL, {"email": email})
+
         if not db_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        
+
         return db_user
-    
+
     @staticmethod
-    def update_user(db: Session, user: UserModel, user_update: UserUpdate) -> UserModel:
+    async def update_user(db: AsyncSession, user: UserModel, user_update: UserUpdate) -> UserModel:
         """Update user information"""
-        update_data = user_update.dict(exclude_unset=True)
-        
+        update_data = user_update.model_dump(exclude_unset=True)
+
         # If email or username is being updated, check for conflicts
         if "email" in update_data or "username" in update_data:
             new_email = update_data.get("email", user.email)
             new_username = update_data.get("username", user.username)
-            
-            # Check if new email or username conflicts with existing users
-            existing_user = db.query(UserModel).filter(
-                UserModel.id != user.id,  # Exclude current user
-                (UserModel.email == new_email) | (UserModel.username == new_username)
-            ).first()
-            
+
+            # Check if new email or username conflicts with existing users;
+            # only the two columns needed to attribute the conflict are
+            # fetched, not whole rows with password hashes
+            result = await db.execute(
+                select(UserModel.email, UserModel.username).where(
+                    UserModel.id != user.id,  # Exclude current user
+                    (UserModel.email == new_email) | (UserModel.username == new_username)
+                ).limit(1)
+            )
+            existing_user = result.first()
+
             if existing_user:
                 if existing_user.email == new_email:
                     raise HTTPException(
@@ -139,29 +210,81 @@ class UserService:
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Username already taken"
                     )
-        
-        # Update user fields
-        for field, value in update_data.items():
-            setattr(user, field, value)
-        
-        db.commit()
-        db.refresh(user)
-        
-        logger.info(f"User updated successfully: {user.email}")
-        
-        return user
-    
+
+        if not update_data:
+            return user
+
+        # One UPDATE ... RETURNING instead of setattr + flush + refresh
+        result = await db.execute(
+            update(UserModel)
+            .where(UserModel.id == user.id)
+            .values(**update_data)
+            .returning(UserModel)
+        )
+        updated = result.scalar_one()
+
+        await db.commit()
+
+        # Drop the cached snapshot so readers see the new values immediately
+        try:
+            await async_redis.delete(_user_cache_key(user.id))
+        except Exception:
+            pass
+
+        logger.info(f"User updated successfully: {updated.email}")
+
+        return updated
+
     @staticmethod
-    def delete_user(db: Session, user_id: int) -> None:
+    async def delete_user(db: AsyncSession, user_id: int) -> None:
         """Delete user by ID"""
-        db_user = UserService.get_user_by_id(db, user_id)
-        
-        db.delete(db_user)
-        db.commit()
-        
-        logger.info(f"User deleted successfully: {db_user.email}")
-    
+        # Single DELETE ... RETURNING instead of a fetch followed by a delete
+        result = await db.execute(
+            delete(UserModel).where(UserModel.id == user_id).returning(UserModel.email)
+        )
+        email = result.scalar_one_or_none()
+
+        if email is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+
+        await db.commit()
+
+        try:
+            await async_redis.delete(_user_cache_key(user_id))
+        except Exception:
+            pass
+
+        logger.info(f"User deleted successfully: {email}")
+
     @staticmethod
-    def list_users(db: Session, skip: int = 0, limit: int = 100) -> list[UserModel]:
-        """Get paginated list of users"""
-        return db.query(UserModel).offset(skip).limit(limit).all()
+    async def list_users(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> tuple[list[UserModel], Optional[str]]:
+        """Get a page of users plus the cursor for the next page"""
+        stmt = select(UserModel)
+
+        # Keyset pagination instead of OFFSET: constant cost per page
+        if cursor:
+            last_ts, last_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(UserModel.created_at, UserModel.id) < (last_ts, last_id)
+            )
+
+        stmt = stmt.order_by(
+            UserModel.created_at.desc(), UserModel.id.desc()
+        ).limit(limit)
+
+        users = list((await db.execute(stmt)).scalars().all())
+
+        next_cursor = None
+        if len(users) == limit and users:
+            last = users[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        return users, next_cursor
@@ -0,0 +1,48 @@
+import pytest_asyncio
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement executed while the block runs.
+
+    Yields the list of statements so tests can assert on query counts and
+    lock in the eager-loading / single-statement work: a reintroduced lazy
+    load on Post.author shows up as an extra SELECT per row and fails the
+    assertion instead of silently shipping an N+1.
+    """
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Async engines proxy a sync engine underneath; events attach there
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    """In-memory SQLite engine with the schema created"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine):
+    """Session against the test engine, mirroring app.database.SessionLocal"""
+    maker = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with maker() as session:
+        yield session
@@ -0,0 +1,45 @@
+import pytest
+
+from app.models import Post as PostModel, User as UserModel
+from app.services.post_service import PostService
+from app.services.user_service import UserService
+
+from tests.conftest import count_queries
+
+
+async def _seed(db, n_posts: int = 5) -> None:
+    author = UserModel(
+        email="author@example.com",
+        username="author",
+        hashed_password="x",
+        is_active=True,
+    )
+    db.add(author)
+    await db.commit()
+
+    for i in range(n_posts):
+        db.add(PostModel(title=f"post {i}", author_id=author.id, is_published=True))
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_list_posts_query_count(engine, db):
+    """One SELECT for the page plus one selectinload batch for authors"""
+    await _seed(db)
+
+    with count_queries(engine) as queries:
+        posts, _ = await PostService.list_posts(db, limit=50)
+
+    assert len(posts) == 5
+    assert len(queries) <= 2, queries
+
+
+@pytest.mark.asyncio
+async def test_list_users_query_count(engine, db):
+    await _seed(db)
+
+    with count_queries(engine) as queries:
+        users, _ = await UserService.list_users(db, limit=50)
+
+    assert len(users) == 1
+    assert len(queries) == 1, queries